@@ -1,14 +1,25 @@
 """Crank.py - Lightweight Python wrapper for Crank JavaScript framework"""
 import inspect
+import re
 import sys
 from pyscript.ffi import to_js, create_proxy
 from pyscript.js_modules import crank_core as crank
+from js import Object as _JsObject
+
+# Runtime detection - decided once, never re-checked
+_is_micropython = sys.implementation.name == 'micropython'
+
+# JS objects handed back to Python (Pyodide only)
+try:
+    from pyodide.ffi import JsProxy as _JsProxy
+except ImportError:
+    _JsProxy = ()
 
 # Typing imports with MicroPython compatibility
 try:
     from typing import Any, AsyncIterator, Callable, Dict, Generic, Iterator, List, TypedDict, TypeVar, Union
 except ImportError:
-    if sys.implementation.name != 'micropython':
+    if not _is_micropython:
         raise
 
     from .typing_stub import Any, AsyncIterator, Callable, Dict, Generic, Iterator, List, TypedDict, TypeVar, Union
@@ -23,14 +34,143 @@ Raw = crank.Raw
 Text = crank.Text
 
 # Global state
-_as_object_map_type_patched = False
-_is_micropython = sys.implementation.name == 'micropython'
 
-def _create_proxy(func):
-    """Create proxy without caching - auto mode handles cleanup"""
-    if _is_micropython:
+# Children that createElement accepts without a to_js conversion
+_PRIMITIVE_CHILD_TYPES = (str, int, float, bool, type(None))
+
+# One props-less ElementBuilder per HTML tag name, shared by h.<tag> lookups.
+# Builders never mutate themselves, so sharing them is safe.
+_tag_builder_cache = {}
+
+# snake_case → kebab-case prop names already converted by _kebab_case()
+_prop_name_cache = {}
+
+# TypeError messages that indicate a component or callback was called with the
+# wrong arity
+_PARAM_ERROR_RE = re.compile(r'takes|positional argument|missing|given')
+
+# Cached names are interned so later dict lookups hit on identity
+# (MicroPython has no sys.intern)
+_intern = getattr(sys, 'intern', None) or (lambda name: name)
+
+# Introspection helpers bound once rather than looked up per render
+_isgenerator = inspect.isgenerator
+_isgeneratorfunction = inspect.isgeneratorfunction
+_unwrap = getattr(inspect, 'unwrap', None)  # MicroPython has no inspect.unwrap
+
+# Create proxies without caching - auto mode handles cleanup. A func -> proxy
+# cache would keep every handler alive through the JS <-> Python cycle.
+if _is_micropython:
+    def _create_proxy(func):
+        """MicroPython: Python callables are passed to JS directly"""
         return func
-    return create_proxy(func)
+else:
+    _create_proxy = create_proxy
+
+
+def _resolve_arity(func):
+    """Statically count the parameters of func, or None if it can't be inspected"""
+    # Bound method (before or after unwrapping) - self is supplied automatically
+    bound = getattr(func, '__self__', None) is not None
+
+    # functools.wraps wrappers: count the wrapped function's parameters, as
+    # inspect.signature does, not the wrapper's (*args, **kwargs)
+    if _unwrap is not None and hasattr(func, '__wrapped__'):
+        func = _unwrap(func)
+
+    # Plain functions: read the code object directly (no signature walk)
+    code = getattr(func, '__code__', None)
+    argcount = getattr(code, 'co_argcount', None)
+    if argcount is not None:
+        flags = getattr(code, 'co_flags', 0)
+        argcount += getattr(code, 'co_kwonlyargcount', 0)
+        argcount += bool(flags & 0x04) + bool(flags & 0x08)  # *args, **kwargs
+        if bound or getattr(func, '__self__', None) is not None:
+            argcount -= 1
+        return argcount
+
+    # Other callables (partials, callable objects, builtins)
+    try:
+        return len(inspect.signature(func).parameters)
+    except (AttributeError, TypeError, ValueError):
+        # MicroPython has no inspect.signature
+        return None
+
+
+def _kebab_case(name):
+    """Convert a snake_case prop name to kebab-case, once per distinct name"""
+    converted = _intern(name.replace('_', '-')) if '_' in name else name
+    _prop_name_cache[name] = converted
+    return converted
+
+
+def _props_to_js(props, to_js=to_js):
+    """Convert props to a fresh JS object for one createElement call"""
+    # Never share the result between elements - createElement may write
+    # children onto the props object it is given
+    if not props:
+        return None
+    return to_js(props)
+
+
+def _to_js_child(child, to_js=to_js):
+    """Convert a child for createElement, skipping values that are already JS"""
+    # to_js (like createElement in the __getitem__ methods) is bound as a
+    # default argument so the per-child path reads a local, not a global
+    child_type = type(child)
+    if child_type in _PRIMITIVE_CHILD_TYPES:
+        # Text, numbers, booleans and None cross the FFI boundary as-is
+        return child
+    if isinstance(child, _JsProxy):
+        # Elements created by createElement - nothing to convert
+        return child
+    if child_type is ElementBuilder:
+        # Bare h.<tag> used as a child
+        return child._create_element()
+    if child_type is list or child_type is tuple:
+        return to_js([_to_js_child(item) for item in child])
+    return to_js(child)
+
+
+def _process_prop_value(value):
+    """Proxy a callable prop value (or callables nested in a dict/list/tuple)"""
+    if callable(value):
+        # JS functions (Pyodide JsProxy) are passed through. On MicroPython
+        # _JsProxy is () and _create_proxy returns the value unchanged anyway
+        if isinstance(value, _JsProxy):
+            # Already a proxy
+            return value
+        # Hybrid proxy: use appropriate strategy based on interpreter
+        return _create_proxy(value)
+    elif isinstance(value, dict):
+        # Recursively process nested dicts
+        return _process_props(value)
+    elif isinstance(value, (list, tuple)):
+        # Process lists/tuples for callables
+        processed_list = []
+        for item in value:
+            if callable(item) and not isinstance(item, _JsProxy):
+                # Hybrid proxy: use appropriate strategy based on interpreter
+                processed_list.append(_create_proxy(item))
+            else:
+                processed_list.append(item)
+        return processed_list
+    return value
+
+
+def _process_props(props):
+    """Process props to create proxies for callables"""
+    # Single pass, copy-on-write: leaf-only props (strings, numbers, ...) are
+    # returned unchanged, and leaf values are never re-checked once copied
+    processed = None
+    for key, value in props.items():
+        if callable(value) or isinstance(value, (dict, list, tuple)):
+            if processed is None:
+                processed = dict(props)
+            processed[key] = _process_prop_value(value)
+    if processed is None:
+        return props
+    return processed
 
 
 def _js_to_python_dict(js_obj):
@@ -39,42 +179,174 @@ def _js_to_python_dict(js_obj):
     if hasattr(js_obj, 'to_py'):
         return js_obj.to_py()
 
-    # MicroPython: Manual conversion using hasOwnProperty
+    # MicroPython: Object.keys() lists exactly the own enumerable props, so no
+    # dir() walk over the prototype chain and no hasOwnProperty filtering
     result = {}
-    for prop_name in dir(js_obj):
-        if js_obj.hasOwnProperty(prop_name):
-            prop_value = getattr(js_obj, prop_name)
-            if not callable(prop_value):
-                result[prop_name] = prop_value
+    for prop_name in _JsObject.keys(js_obj):
+        result[prop_name] = getattr(js_obj, prop_name)
     return result
 
 
+
+class LazyJsDict:
+    """Dict-like view of JS props that converts values only when they're read"""
+
+    __slots__ = ('_js_obj', '_cache', '_dict')
+
+    def __init__(self, js_obj):
+        self._js_obj = js_obj
+        self._cache = {}  # Keys converted so far
+        # Full conversion, built on first whole-object use (no props: empty)
+        self._dict = {} if js_obj is None else None
+
+    def _materialize(self):
+        """Convert every prop at once (iteration, len, comparison, mutation)"""
+        result = self._dict
+        if result is None:
+            result = self._dict = _js_to_python_dict(self._js_obj)
+        return result
+
+    def __getitem__(self, key):
+        result = self._dict
+        if result is not None:
+            return result[key]
+        cache = self._cache
+        if key in cache:
+            return cache[key]
+        js_obj = self._js_obj
+        if type(key) is not str or not js_obj.hasOwnProperty(key):
+            raise KeyError(key)
+        value = getattr(js_obj, key)
+        if isinstance(value, _JsProxy):
+            # Pyodide: nested objects and arrays, as to_py() would convert them
+            value = value.to_py()
+        cache[key] = value
+        return value
+
+    def __getattr__(self, name):
+        """Attribute access to props (props.title), as on the JS object"""
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        """Eagerly convert every prop to a plain dict"""
+        return dict(self._materialize())
+
+    def __contains__(self, key):
+        result = self._dict
+        if result is not None:
+            return key in result
+        return key in self._cache or (type(key) is str and bool(self._js_obj.hasOwnProperty(key)))
+
+    def __len__(self):
+        return len(self._materialize())
+
+    def __iter__(self):
+        return iter(self._materialize())
+
+    def keys(self):
+        return self._materialize().keys()
+
+    def values(self):
+        return self._materialize().values()
+
+    def items(self):
+        return self._materialize().items()
+
+    def copy(self):
+        return dict(self._materialize())
+
+    def __eq__(self, other):
+        if isinstance(other, LazyJsDict):
+            other = other._materialize()
+        return self._materialize() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(self._materialize())
+
+    # Mutation works on the converted dict
+    def __setitem__(self, key, value):
+        self._materialize()[key] = value
+
+    def __delitem__(self, key):
+        del self._materialize()[key]
+
+    def setdefault(self, key, default=None):
+        return self._materialize().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        self._materialize().update(*args, **kwargs)
+
+    def pop(self, key, *default):
+        return self._materialize().pop(key, *default)
+
 def _patch_as_object_map_type():
     """Patch the dynamic type created by as_object_map() to support chainable elements"""
-    global _as_object_map_type_patched
-    if _as_object_map_type_patched:
-        return
-
     dummy_elem = createElement('div', None)
-    if hasattr(dummy_elem, 'as_object_map'):
-        mapped = dummy_elem.as_object_map()
-        mapped_type = type(mapped)
-
-        def chainable_getitem(self, children):
-            if hasattr(self, '_crank_tag') and hasattr(self, '_crank_props'):
-                if not isinstance(children, (list, tuple)):
-                    children = [children]
-                js_children = [to_js(child) if not isinstance(child, str) else child for child in children]
-                js_props = to_js(self._crank_props) if self._crank_props else None
-                return createElement(self._crank_tag, js_props, *js_children)
-            else:
-                try:
-                    return getattr(self, children)
-                except AttributeError:
-                    raise KeyError(children) from None
+    if not hasattr(dummy_elem, 'as_object_map'):
+        return False
+
+    mapped = dummy_elem.as_object_map()
+    mapped_type = type(mapped)
+
+    def chainable_getitem(self, children, createElement=createElement, _to_js_child=_to_js_child):
+        if hasattr(self, '_crank_tag') and hasattr(self, '_crank_props'):
+            if not isinstance(children, (list, tuple)):
+                children = [children]
+            js_children = [_to_js_child(child) for child in children]
+            js_props = _props_to_js(self._crank_props)
+            return createElement(self._crank_tag, js_props, *js_children)
+        else:
+            try:
+                return getattr(self, children)
+            except AttributeError:
+                raise KeyError(children) from None
+
+    mapped_type.__getitem__ = chainable_getitem
+    return True
+
+
+def _make_pyodide_chainable(element, tag_or_component, props):
+    """Create Pyodide chainable element using as_object_map approach"""
+    # Use as_object_map to make the element subscriptable
+    chainable = element.as_object_map()
+
+    # Mark this as a chainable element for our patched __getitem__
+    chainable._crank_tag = tag_or_component
+    chainable._crank_props = props
+    return chainable
+
+
+def _make_micropython_chainable(element, tag_or_component, props):
+    """MicroPython: Return raw element - subscription works directly"""
+    return element
 
-        mapped_type.__getitem__ = chainable_getitem
-        _as_object_map_type_patched = True
+
+# Check for (and patch) as_object_map once at import rather than per element
+if _is_micropython:
+    _HAS_AS_OBJECT_MAP = False
+else:
+    try:
+        _HAS_AS_OBJECT_MAP = _patch_as_object_map_type()
+    except Exception:
+        _HAS_AS_OBJECT_MAP = False
+
+# Pick the runtime-specific implementation once at import (without
+# as_object_map the original element is returned unchanged)
+_make_chainable = _make_pyodide_chainable if _HAS_AS_OBJECT_MAP else _make_micropython_chainable
 
 
 # Type variables for generic Context
@@ -94,9 +366,51 @@ except (TypeError, ImportError):
     Children = object
 
 
+def _adapt_callback(func, param_count):
+    """Wrap func so it accepts whatever arguments Crank passes to callbacks"""
+    # The wrapper's shape is chosen once here rather than on every call
+    if param_count == 0:
+        def variadic_wrapper(*args):
+            return func()
+    elif param_count is not None:
+        def variadic_wrapper(*args):
+            if args:
+                return func(args[0])
+            return func()
+    else:
+        # MicroPython fallback - try different calling patterns, then remember
+        # which one worked so later calls skip the try/except
+        cached_arity = None
+
+        def variadic_wrapper(*args):
+            nonlocal cached_arity
+            if len(args) == 0:
+                return func()
+            elif len(args) == 1:
+                if cached_arity == 1:
+                    return func(args[0])
+                if cached_arity == 0:
+                    return func()
+                try:
+                    result = func(args[0])
+                except TypeError as e:
+                    if not _PARAM_ERROR_RE.search(str(e).lower()):
+                        # A real error raised inside the callback
+                        raise
+                    # Function doesn't accept arguments
+                    result = func()
+                    cached_arity = 0
+                    return result
+                cached_arity = 1
+                return result
+            else:
+                raise TypeError(f"Callback function takes at most 1 argument, got {len(args)}")
+    return variadic_wrapper
+
+
 # Context wrapper to add Python-friendly API with generic typing
 # MicroPython doesn't support Generic subscripting, so use conditional inheritance
-if sys.implementation.name == 'micropython':
+if _is_micropython:
     # MicroPython fallback - plain class without generics
     _ContextBase = object
 else:
@@ -106,6 +420,9 @@ else:
 class Context(_ContextBase):
     """Wrapper for Crank Context with additional Python conveniences"""
 
+    # One Context is created per component call - no per-instance __dict__
+    __slots__ = ('_js_context', '_refresh', '_schedule', '_after', '_cleanup', '_provide', '_consume')
+
     def __init__(self, js_context):
         self._js_context = js_context
         # Store original methods with safe access
@@ -131,37 +448,9 @@ class Context(_ContextBase):
         """Common logic for registering callbacks with proper proxy handling"""
         if callback_method and callable(func):
             # Create a variadic wrapper that adapts to function signature
-            try:
-                sig = inspect.signature(func)
-                param_count = len(sig.parameters)
-            except (AttributeError, ValueError):
-                # MicroPython fallback - try calling with different arg counts
-                param_count = None
-
-            def variadic_wrapper(*args):
-                if param_count is not None:
-                    # Use signature inspection
-                    if param_count == 0:
-                        return func()
-                    elif param_count >= 1 and len(args) >= 1:
-                        return func(args[0])
-                    elif len(args) == 0:
-                        return func()
-                    else:
-                        raise TypeError(f"Function expects {param_count} args, got {len(args)}")
-                else:
-                    # MicroPython fallback - try different calling patterns
-                    if len(args) == 0:
-                        return func()
-                    elif len(args) == 1:
-                        try:
-                            return func(args[0])
-                        except TypeError:
-                            # Function doesn't accept arguments
-                            return func()
-                    else:
-                        raise TypeError(f"Callback function takes at most 1 argument, got {len(args)}")
-
+            # (None: arity unknown, the wrapper tries different arg counts)
+            param_count = _resolve_arity(func)
+            variadic_wrapper = _adapt_callback(func, param_count)
             proxy = _create_proxy(variadic_wrapper)
             callback_method(proxy)
         return func
@@ -186,10 +475,14 @@ class Context(_ContextBase):
         """Consume context value"""
         return self._consume(*args, **kwargs)
 
+    # Single props conversion shared by sync/async iteration and .props
+    _convert_props = LazyJsDict
+
     def __iter__(self):
         """Delegate to JS context iteration with props conversion"""
+        convert = self._convert_props
         for js_props in self._js_context:
-            yield _js_to_python_dict(js_props)
+            yield convert(js_props)
 
     def __aiter__(self):
         """Return async iterator"""
@@ -197,19 +490,22 @@ class Context(_ContextBase):
 
     async def _async_iterator(self):
         """Async generator for context iteration"""
+        convert = self._convert_props
         async for js_props in self._js_context:
-            yield _js_to_python_dict(js_props)
+            yield convert(js_props)
 
 
     @property
     def props(self) -> T:
         """Access current props with proper typing"""
-        return _js_to_python_dict(self._js_context.props)  # type: ignore[return-value]
+        return self._convert_props(self._js_context.props)  # type: ignore[return-value]
 
 
 class MicroPythonGeneratorWrapper:
     """Wrapper that makes Python generators compatible with JavaScript"""
 
+    __slots__ = ('python_generator',)
+
     def __init__(self, python_generator):
         self.python_generator = python_generator
 
@@ -221,148 +517,142 @@ class MicroPythonGeneratorWrapper:
                 result = self.python_generator.send(value)
             return {"value": result, "done": False}
         except StopIteration as e:
-            return {"value": getattr(e, 'value', None), "done": True}
+            return _done_result(getattr(e, 'value', None))
 
     def throw(self, exception):
         try:
             result = self.python_generator.throw(exception)
             return {"value": result, "done": False}
         except StopIteration as e:
-            return {"value": getattr(e, 'value', None), "done": True}
+            return _done_result(getattr(e, 'value', None))
 
     def return_(self, value=None):
         try:
             self.python_generator.close()
         except GeneratorExit:
             pass
-        return {"value": value, "done": True}
+        return _done_result(value)
+
+
+# Finished generators usually return None, so that result is shared. Crank only
+# reads iterator results; in-progress results are still built per step since
+# their values differ every time.
+_DONE_RESULT = {"value": None, "done": True}
+
+
+def _done_result(value):
+    """Iterator result for a finished generator"""
+    if value is None:
+        return _DONE_RESULT
+    return {"value": value, "done": True}
 
 
 # Bind return_ as 'return' for JavaScript compatibility
 setattr(MicroPythonGeneratorWrapper, 'return', MicroPythonGeneratorWrapper.return_)
 
 
-def component(func: Callable) -> Callable:
-    # Cache parameter count per component instance using nonlocal
-    cached_param_count = None
+def _return_result(result):
+    """Default: treat as sync function component result, return as-is"""
+    return result
 
-    # Only validate signature using static inspection at decoration time
-    # Don't call the function to avoid side effects
 
-    # In full Python, use inspect.signature for accurate detection
-    try:
-        sig = inspect.signature(func)
-        param_count = len(sig.parameters)
-        # Cache the result for later use
-        cached_param_count = param_count
-
-        # Validate parameter count - Crank components can have 0, 1, or 2 parameters
-        if param_count > 2:
-            raise ValueError(
-                f"Component function {getattr(func, '__name__', '<anonymous>')} has incompatible signature. "
-                f"Expected 0, 1 (ctx), or 2 (ctx, props) parameters."
-            )
-    except AttributeError:
-        # MicroPython fallback - we'll determine parameter count at runtime
-        # Don't call the function here to avoid side effects
-        pass
-
-    def wrapper(props, ctx):
-        """Wrapper that adapts Crank's (props, ctx) calling convention"""
-        nonlocal cached_param_count
+def _wrap_generator_result(result):
+    """Wrap generator results for JavaScript interop"""
+    if _isgenerator(result):
+        return MicroPythonGeneratorWrapper(result)
+    return result
 
 
+def component(func: Callable) -> Callable:
+    # Resolve the parameter count once, statically, at decoration time
+    # Don't call the function to avoid side effects
+    cached_param_count = _resolve_arity(func)
+
+    # Validate parameter count - Crank components can have 0, 1, or 2 parameters
+    if cached_param_count is not None and cached_param_count > 2:
+        raise ValueError(
+            f"Component function {getattr(func, '__name__', '<anonymous>')} has incompatible signature. "
+            f"Expected 0, 1 (ctx), or 2 (ctx, props) parameters."
+        )
+
+    # Decide once, alongside arity, how results are handed back to Crank
+    # MicroPython generators need wrapping for JavaScript interop
+    if not _is_micropython:
+        wrap_result = _return_result
+    elif _isgeneratorfunction(func):
+        wrap_result = MicroPythonGeneratorWrapper
+    else:
+        # Plain functions may still return a generator
+        wrap_result = _wrap_generator_result
+
+    # One call per supported arity, indexed by parameter count
+    def _call0(props, ctx):
+        """Call a component that takes no parameters"""
+        return func()
+
+    def _call1(props, ctx):
+        """Call a component that takes (ctx)"""
         # Wrap the JS context with our Python Context wrapper
-        wrapped_ctx = Context(ctx)
+        return func(Context(ctx))
 
-        # Convert props to Python dict for dual runtime compatibility
-        if hasattr(props, 'to_py'):
-            # Pyodide: Use to_py() method
-            python_props = props.to_py() if props else {}
-        else:
-            # MicroPython: Use direct property access instead of JavaScript evaluation
-            if props and sys.implementation.name == 'micropython':
-                try:
-                    # Convert all available properties from JavaScript object
-                    python_props = {}
-                    for prop_name in dir(props):
-                        # Skip internal properties and common object methods
-                        if (not prop_name.startswith('_') and
-                            prop_name not in ['constructor', 'toString', 'valueOf', 'hasOwnProperty']):
-                            try:
-                                prop_value = getattr(props, prop_name)
-                                if prop_value is not None and not callable(prop_value):
-                                    python_props[prop_name] = prop_value
-                            except:
-                                # Ignore props we can't access
-                                pass
-
-                except Exception:
-                    # If any error occurs, fall back to empty props
-                    python_props = {}
-            else:
-                python_props = {}
+    def _call2(props, ctx):
+        """Call a component that takes (ctx, props)"""
+        # Wrap props so only the ones the component reads are converted
+        return func(Context(ctx), LazyJsDict(props))
 
-        def wrap_result(result):
-            """Wrap generator results for JavaScript interop"""
-            # MicroPython generators need wrapping for JavaScript interop
-            if sys.implementation.name == 'micropython' and inspect.isgenerator(result):
-                return MicroPythonGeneratorWrapper(result)
+    calls = (_call0, _call1, _call2)
 
-            # Default: treat as sync function component result, return as-is
-            return result
+    def _adapting_wrapper(props, ctx):
+        """Wrapper that adapts Crank's (props, ctx) calling convention"""
+        nonlocal cached_param_count
 
-        # Check if we have cached parameter count
         if cached_param_count is not None:
-            # Use cached parameter count
-            if cached_param_count == 0:
-                result = func()
-                return wrap_result(result)
-            elif cached_param_count == 1:
-                result = func(wrapped_ctx)
-                return wrap_result(result)
-            else:  # cached_param_count == 2
-                result = func(wrapped_ctx, python_props)
+            return wrap_result(calls[cached_param_count](props, ctx))
+
+        # Arity couldn't be resolved statically - probe on first call only
+        # Try different parameter counts and cache the successful one
+        wrapped_ctx = Context(ctx)
+        python_props = LazyJsDict(props)
+        for test_count in [2, 1, 0]:  # Try most common first
+            try:
+                if test_count == 0:
+                    result = func()
+                elif test_count == 1:
+                    result = func(wrapped_ctx)
+                else:  # test_count == 2
+                    result = func(wrapped_ctx, python_props)
+
+                # Success! Cache this parameter count for future calls
+                cached_param_count = test_count
                 return wrap_result(result)
-        else:
-            # MicroPython runtime - determine parameter count on first call
-            # Try different parameter counts and cache the successful one
-            for test_count in [2, 1, 0]:  # Try most common first
-                try:
-                    if test_count == 0:
-                        result = func()
-                    elif test_count == 1:
-                        result = func(wrapped_ctx)
-                    else:  # test_count == 2
-                        result = func(wrapped_ctx, python_props)
-
-                    # Success! Cache this parameter count for future calls
-                    cached_param_count = test_count
-                    return wrap_result(result)
 
-                except TypeError as e:
-                    # Check if this looks like a parameter count error
-                    error_msg = str(e).lower()
-                    if any(phrase in error_msg for phrase in [
-                        'takes', 'positional argument', 'missing', 'given'
-                    ]):
-                        # This is likely a parameter count mismatch, try next count
-                        continue
-                    else:
-                        # This is likely a real error in user code
-                        # Cache this parameter count and re-raise the error
-                        cached_param_count = test_count
-                        raise
-                except Exception:
-                    # Some other error - cache this parameter count and re-raise
+            except TypeError as e:
+                # Check if this looks like a parameter count error
+                if _PARAM_ERROR_RE.search(str(e).lower()):
+                    # This is likely a parameter count mismatch, try next count
+                    continue
+                else:
+                    # This is likely a real error in user code
+                    # Cache this parameter count and re-raise the error
                     cached_param_count = test_count
                     raise
-
-            # If we get here, none of the parameter counts worked
-            raise ValueError(
-                f"Component function {getattr(func, '__name__', '<anonymous>')} has incompatible signature. "
-                f"Expected 0, 1 (ctx), or 2 (ctx, props) parameters."
-            )
+            except Exception:
+                # Some other error - cache this parameter count and re-raise
+                cached_param_count = test_count
+                raise
+
+        # If we get here, none of the parameter counts worked
+        raise ValueError(
+            f"Component function {getattr(func, '__name__', '<anonymous>')} has incompatible signature. "
+            f"Expected 0, 1 (ctx), or 2 (ctx, props) parameters."
+        )
+
+    # With a known arity and nothing to wrap (Pyodide), Crank calls the
+    # arity's call directly, so renders don't branch on either
+    if cached_param_count is not None and wrap_result is _return_result:
+        wrapper = calls[cached_param_count]
+    else:
+        wrapper = _adapting_wrapper
 
     # Create proxy without caching - auto mode handles cleanup
     return _create_proxy(wrapper)
@@ -415,13 +705,18 @@ Pythonic HyperScript - Supported Patterns
 
     def __getattr__(self, name: str):
         # Only support HTML elements, no dynamic component lookup
-        return ElementBuilder(name)
+        builder = _tag_builder(name)
+        if not name.startswith('_'):
+            # Store it on the instance so later h.<name> lookups find it
+            # directly instead of going through __getattr__
+            setattr(self, name, builder)
+        return builder
 
     def __getitem__(self, tag_or_component):
         # Dynamic tag/component access: j[variable]
         if isinstance(tag_or_component, str):
             # String tag name
-            return ElementBuilder(tag_or_component)
+            return _tag_builder(tag_or_component)
         elif callable(tag_or_component):
             # Component function
             return ElementBuilder(tag_or_component)
@@ -430,220 +725,154 @@ Pythonic HyperScript - Supported Patterns
 
     def __call__(self, *args, **kwargs):
         # Support h(tag, props, children), h(Component, **props), h(Fragment, **props), and h(children) syntax
-        if len(args) >= 1:
-            # Any first argument: h(tag/component/variable, **props)
-            tag_or_component = args[0]
-
-            # Handle old syntax: h(tag, {props}, children)
-            if len(args) > 1 and isinstance(args[1], dict) and len(kwargs) == 0:
-                props = args[1]
-                children = args[2:]
-            else:
-                # New syntax: h(tag, **props) - kwargs as props, remaining args as children
-                props = kwargs
-                children = args[1:]  # Any extra positional args as children
-
-            # Process props for callables
-            processed_props = self._process_props_for_proxies(props) if props else {}
-            js_props = to_js(processed_props) if processed_props else None
-
-            # Special handling for Fragment
-            if tag_or_component is Fragment or (isinstance(tag_or_component, str) and tag_or_component == ""):
-                if children:
-                    return createElement(Fragment, js_props, *children)
-                else:
-                    # Fragment with no children - return FragmentBuilder for bracket syntax
-                    return FragmentBuilder(js_props)
-
-            # For any other tag/component
-            element = createElement(tag_or_component, js_props, *children)
-
-            # Always make it chainable for bracket syntax (can overwrite children like JSX)
-            return self._make_element_chainable(element, tag_or_component, processed_props)
-        else:
+        if not args:
             # Fragment with children: h(children)
-            return createElement(Fragment, None, *args)
+            return createElement(Fragment, None)
+
+        # Any first argument: h(tag/component/variable, **props)
+        tag_or_component = args[0]
+
+        # Handle old syntax: h(tag, {props}, children)
+        if len(args) > 1 and not kwargs and isinstance(args[1], (dict, LazyJsDict)):
+            props = args[1]
+            if type(props) is LazyJsDict:
+                # A component passing its own props on: h(Child, props)
+                props = props.to_dict()
+            children = args[2:]
+        else:
+            # New syntax: h(tag, **props) - kwargs as props, remaining args as children
+            props = kwargs
+            children = args[1:]  # Any extra positional args as children
 
-    def _process_props_for_proxies(self, props):
-        """Process props to create proxies for callables"""
-        processed = {}
-        for key, value in props.items():
-            if callable(value):
-                # Hybrid proxy: use appropriate strategy based on interpreter
-                processed[key] = _create_proxy(value)
-            else:
-                processed[key] = value
-        return processed
+        if children:
+            # Same child conversion as bracket syntax
+            children = [_to_js_child(child) for child in children]
 
+        # Process props for callables
+        processed_props = _process_props(props) if props else {}
 
-    def _make_element_chainable(self, element, tag_or_component, props):
-        """Make an element chainable for bracket syntax"""
-        import sys
+        # Dispatch on the tag's type once: strings are HTML tags (or "" for
+        # Fragment), anything else is a component or special tag
+        if type(tag_or_component) is str:
+            is_fragment = not tag_or_component
+        else:
+            is_fragment = tag_or_component is Fragment
 
-        # MicroPython doesn't need special handling - subscription works directly
-        if sys.implementation.name == 'micropython':
-            return element
+        if is_fragment:
+            if children:
+                return createElement(Fragment, _props_to_js(processed_props), *children)
+            # Fragment with no children - return FragmentBuilder for bracket syntax
+            return FragmentBuilder(processed_props)
 
-        # Pyodide: Use as_object_map and mark it for our patched __getitem__
-        try:
-            _patch_as_object_map_type()  # Ensure patch is applied
-
-            if hasattr(element, 'as_object_map'):
-                chainable = element.as_object_map()
-                # Mark this as a chainable element for our patched __getitem__
-                chainable._crank_tag = tag_or_component
-                chainable._crank_props = props
-                return chainable
-            else:
-                return element
-        except Exception:
-            return element
+        # For any other tag/component
+        element = createElement(tag_or_component, _props_to_js(processed_props), *children)
 
+        # Positional children complete the element - only make it chainable
+        # when bracket syntax can still supply (or overwrite) the children
+        if children:
+            return element
+        return _make_chainable(element, tag_or_component, processed_props)
 
 
 class ElementBuilder:
+    __slots__ = ('tag_or_component', 'props', '_element')
+
     def __init__(self, tag_or_component, props=None):
         self.tag_or_component = tag_or_component
         self.props = props
-        self._element = None  # Lazy-created element
-
-    def _is_micropython_runtime(self):
-        """Detect if running on MicroPython runtime."""
-        import sys
-        return sys.implementation.name == 'micropython'
+        self._element = None  # Lazy-created element (builders with props only)
 
+    def _create_element(self, createElement=createElement):
+        """The element this builder stands for when used without children"""
+        if not self.props:
+            # Shared per-tag builder - every use needs its own element
+            return createElement(self.tag_or_component, None)
 
-    def _ensure_element(self):
-        """Create the element if it doesn't exist yet"""
-        if self._element is None:
-            js_props = to_js(self.props) if self.props else None
-            self._element = createElement(self.tag_or_component, js_props)
-        return self._element
+        # A builder with props belongs to one h.<tag>(...) call, so Crank's
+        # repeated attribute reads all see the same element
+        element = self._element
+        if element is None:
+            element = self._element = createElement(self.tag_or_component, _props_to_js(self.props))
+        return element
 
     def __iter__(self):
         """Make ElementBuilder iterable like an element for Crank"""
-        return iter(self._ensure_element())
+        return iter(self._create_element())
 
     def __str__(self):
-        return str(self._ensure_element())
+        return str(self._create_element())
 
     def __repr__(self):
-        return repr(self._ensure_element())
+        return repr(self._create_element())
 
     def __getattr__(self, name):
         """Delegate attribute access to the element"""
-        return getattr(self._ensure_element(), name)
+        return getattr(self._create_element(), name)
 
-    def __getitem__(self, children):
+    def __getitem__(self, children, createElement=createElement, _to_js_child=_to_js_child):
+        """Build the element; a single list child is spread, so el[[a, b]] is el[a, b]"""
         if not isinstance(children, (list, tuple)):
             children = [children]
 
         # Convert children to JS-compatible format
-        js_children = [to_js(child) if not isinstance(child, str) else child for child in children]
+        js_children = [_to_js_child(child) for child in children]
 
-        # Use stored props if available
-        js_props = to_js(self.props) if self.props else None
-
-        # Create element with children and props
-        return createElement(self.tag_or_component, js_props, *js_children)
+        # Create element with children and the stored props
+        return createElement(self.tag_or_component, _props_to_js(self.props), *js_children)
 
     def __call__(self, *args, **props):
-        # Convert props with underscore to hyphen conversion
-        converted_props = {}
+        # Kebab-case prop names and proxy callables in a single pass, copying
+        # props only when some name or value actually needs converting
+        processed_props = props
         for key, value in props.items():
-            converted_props[key.replace('_', '-')] = value
-
-        # Process props to handle callables (lambdas, functions)
-        processed_props = self._process_props_for_proxies(converted_props) if converted_props else {}
+            if '_' in key or callable(value) or isinstance(value, (dict, list, tuple)):
+                processed_props = {}
+                for key, value in props.items():
+                    processed_props[_prop_name_cache.get(key) or _kebab_case(key)] = _process_prop_value(value)
+                break
 
         if args:
             # If called with children args, create element immediately
-            js_props = to_js(processed_props) if processed_props else None
-            return createElement(self.tag_or_component, js_props, *args)
+            js_props = _props_to_js(processed_props)
+            js_children = [_to_js_child(child) for child in args]
+            return createElement(self.tag_or_component, js_props, *js_children)
         elif props:
-            # If called with just props, create chainable element
-            js_props = to_js(processed_props) if processed_props else None
-            element = createElement(self.tag_or_component, js_props)
+            if _is_micropython:
+                # MicroPython: Return a new ElementBuilder holding the props for bracket
+                # syntax (self may be the shared builder for this tag)
+                return ElementBuilder(self.tag_or_component, processed_props)
 
-            if self._is_micropython_runtime():
-                # MicroPython: Store the element and props in ElementBuilder for bracket syntax
-                self._element = element
-                self.props = processed_props
-                return self  # Return ElementBuilder itself for bracket syntax
-            else:
-                # Pyodide: Use the chainable element approach
-                return self._make_chainable_element(element, processed_props)
+            # Pyodide: Use the chainable element approach
+            js_props = _props_to_js(processed_props)
+            element = createElement(self.tag_or_component, js_props)
+            return _make_chainable(element, self.tag_or_component, processed_props)
         else:
             # If called with no args and no props, create empty element immediately
             return createElement(self.tag_or_component, None)
 
-    def _make_chainable_element(self, element, props):
-        """Convert element into a chainable version using runtime-specific approach"""
-        if self._is_micropython_runtime():
-            # MicroPython: Return raw element to avoid proxy issues
-            # ElementBuilder will handle bracket syntax via its own __getitem__
-            return element
-
-        # Pyodide: Use as_object_map approach with dynamic type patching
-        return self._make_pyodide_chainable_element(element, props)
 
-    def _make_pyodide_chainable_element(self, element, props):
-        """Create Pyodide chainable element using as_object_map approach"""
-        # Ensure the as_object_map type is patched
-        _patch_as_object_map_type()
-
-        # Use as_object_map to make the element subscriptable
-        if hasattr(element, 'as_object_map'):
-            chainable = element.as_object_map()
-
-            # Mark this as a chainable element for our patched __getitem__
-            chainable._crank_tag = self.tag_or_component
-            chainable._crank_props = props
-
-            return chainable
-        else:
-            # Fallback to original element if as_object_map not available
-            return element
-
-    def _process_props_for_proxies(self, props):
-        """Process props to create proxies for callables"""
-        processed = {}
-        for key, value in props.items():
-            if callable(value):
-                # Check if it's already a proxy by looking for pyproxy-specific attributes
-                if hasattr(value, 'toString') or str(type(value)).startswith("<class 'pyodide.ffi.JsProxy'>"):
-                    # Already a proxy
-                    processed[key] = value
-                else:
-                    # Hybrid proxy: use appropriate strategy based on interpreter
-                    processed[key] = _create_proxy(value)
-            elif isinstance(value, dict):
-                # Recursively process nested dicts
-                processed[key] = self._process_props_for_proxies(value)
-            elif isinstance(value, (list, tuple)):
-                # Process lists/tuples for callables
-                processed_list = []
-                for item in value:
-                    if callable(item) and not (hasattr(item, 'toString') or str(type(item)).startswith("<class 'pyodide.ffi.JsProxy'>")):
-                        # Hybrid proxy: use appropriate strategy based on interpreter
-                        processed_list.append(_create_proxy(item))
-                    else:
-                        processed_list.append(item)
-                processed[key] = processed_list
-            else:
-                processed[key] = value
-        return processed
+def _tag_builder(tag):
+    """Return the shared props-less ElementBuilder for an HTML tag"""
+    try:
+        return _tag_builder_cache[tag]
+    except KeyError:
+        tag = _intern(tag)
+        builder = _tag_builder_cache[tag] = ElementBuilder(tag)
+        return builder
 
 
 class FragmentBuilder:
-    def __init__(self, js_props):
-        self.js_props = js_props
+    __slots__ = ('props',)
+
+    def __init__(self, props):
+        self.props = props
 
-    def __getitem__(self, children):
+    def __getitem__(self, children, createElement=createElement, Fragment=Fragment, _to_js_child=_to_js_child):
         if not isinstance(children, (list, tuple)):
             children = [children]
 
-        return createElement(Fragment, self.js_props, *children)
+        js_children = [_to_js_child(child) for child in children]
+        return createElement(Fragment, _props_to_js(self.props), *js_children)
 
 
 # Hyperscript function with magic dot syntax
@@ -9,22 +9,13 @@ from js import Promise, document, requestAnimationFrame, setTimeout
 from crank import component, h
 from crank.dom import renderer
 
-
-def shuffle(arr):
-    """Shuffle array in place and return it."""
-    arr_copy = arr[:]
-    for i in range(len(arr_copy) - 1, 0, -1):
-        j = random.randint(0, i)
-        arr_copy[i], arr_copy[j] = arr_copy[j], arr_copy[i]
-    return arr_copy
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
 
 
 def get_random_letters():
     """Get a random subset of letters from the alphabet, sorted."""
-    alphabet = list("abcdefghijklmnopqrstuvwxyz")
-    shuffled = shuffle(alphabet)
-    count = random.randint(1, len(alphabet))
-    return sorted(shuffled[:count])
+    count = random.randint(1, len(ALPHABET))
+    return sorted(random.sample(ALPHABET, count))
 
 
 def defer_transition_styles(callback):
@@ -90,13 +81,26 @@ def Letter(ctx, props):
 @component
 def Letters(ctx):
     """Container component that manages random letters."""
-    # Set up interval for refreshing
-    interval = setInterval(lambda: ctx.refresh(), 1500)
+    stopped = False
+
+    # Refresh on the next frame after each delay, so no work is done while
+    # the tab is hidden and updates line up with the browser's paint cycle
+    def tick():
+        if stopped:
+            return
+        ctx.refresh()
+        schedule_refresh()
+
+    def schedule_refresh():
+        setTimeout(lambda: requestAnimationFrame(lambda _: tick()), 1500)
 
-    # Clean up interval on unmount
+    schedule_refresh()
+
+    # Stop rescheduling on unmount
     @ctx.cleanup
-    def cleanup_interval():
-        clearInterval(interval)
+    def stop_refreshing():
+        nonlocal stopped
+        stopped = True
 
     # Render loop
     for _ in ctx:
@@ -111,9 +115,6 @@ def Letters(ctx):
         ]
 
 
-# Import setInterval/clearInterval from JS
-from js import clearInterval, setInterval
-
 # Render the component
 if __name__ == "__main__":
     renderer.render(h(Letters), document.body)
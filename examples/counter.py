@@ -28,18 +28,24 @@ def Counter(ctx):
         nonlocal count
         count = 0
 
+    # Static parts, built once
+    title = h.h2["Counter Example"]
+    count_label = h.span(className="count-label")["Count: "]
+    # The handlers never change, so the buttons are static too
+    controls = h.div(className="counter-controls")[
+        h.button(className="btn-decrement", onclick=decrement)["-"],
+        h.button(className="btn-reset", onclick=reset)["Reset"],
+        h.button(className="btn-increment", onclick=increment)["+"],
+    ]
+
     for _ in ctx:
         yield h.div[
-            h.h2["Counter Example"],
+            title,
             h.div(className="counter-display")[
-                h.span(className="count-label")["Count: "],
+                count_label,
                 h.span(className="count-value")[str(count)],
             ],
-            h.div(className="counter-controls")[
-                h.button(className="btn-decrement", onclick=decrement)["-"],
-                h.button(className="btn-reset", onclick=reset)["Reset"],
-                h.button(className="btn-increment", onclick=increment)["+"],
-            ],
+            controls,
         ]
 
 # Render the component
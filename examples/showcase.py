@@ -29,8 +29,12 @@ def Clock(ctx):
             await asyncio.sleep(1)
             ctx.refresh()
 
-    # Start the async update loop
-    asyncio.create_task(update_time())
+    # Start the async update loop (one per instance), stopped on unmount
+    task = asyncio.create_task(update_time())
+
+    @ctx.cleanup
+    def stop_updates():
+        task.cancel()
 
     for _ in ctx:
         current_time = time.strftime("%H:%M:%S")
@@ -8,45 +8,55 @@ from js import document
 from crank import component, h
 from crank.dom import renderer
 
+# <li> class for each (completed, editing) combination, indexed by
+# completed | editing << 1
+_TODO_ITEM_CLASSES = (None, "completed", "editing", "completed editing")
+
 
 @component
 def TodoItem(ctx, props):
     editing = False
     edit_title = ""
+    # Destructured from props once per render; the handlers read this
+    todo = props["todo"]
 
     @ctx.refresh
     def toggle_todo(ev):
         if editing:
             return
-        props["ontoggle"](props["todo"]["id"])
+        props["ontoggle"](todo["id"])
 
     @ctx.refresh
     def delete_todo(ev):
-        props["ondelete"](props["todo"]["id"])
+        props["ondelete"](todo["id"])
 
     @ctx.refresh
     def start_editing(ev):
         nonlocal editing, edit_title
         editing = True
-        edit_title = props["todo"]["title"]
+        edit_title = todo["title"]
 
-    @ctx.refresh
-    def save_edit(ev):
+    # Shared by save_edit and handle_keydown, whose refreshes cover it
+    def commit_edit():
         nonlocal editing
         if edit_title.strip():
-            props["onedit"](props["todo"]["id"], edit_title.strip())
+            props["onedit"](todo["id"], edit_title.strip())
         editing = False
 
     @ctx.refresh
-    def cancel_edit(ev):
+    def save_edit(ev):
+        commit_edit()
+
+    # Only called from handle_keydown, whose refresh covers it
+    def cancel_edit():
         nonlocal editing, edit_title
         editing = False
-        edit_title = props.todo.title
+        edit_title = todo["title"]
 
     @ctx.refresh
     def handle_keydown(ev):
         if ev.key == "Enter":
-            save_edit()
+            commit_edit()
         elif ev.key == "Escape":
             cancel_edit()
 
@@ -55,19 +65,29 @@ def TodoItem(ctx, props):
         nonlocal edit_title
         edit_title = ev.target.value
 
+    # The destroy button's handler never changes - build it once
+    destroy_button = h.button(className="destroy", onclick=delete_todo)
+
+    # Last rendered tree and the state it was built from
+    last_key = None
+    last_tree = None
+
     for props in ctx:
         # Props are now Python dicts - direct access
         todo = props["todo"]
         if not editing:
             edit_title = todo["title"]
 
-        classes = []
-        if todo["completed"]:
-            classes.append("completed")
-        if editing:
-            classes.append("editing")
+        # Unchanged rows yield the previous tree, which Crank skips entirely
+        key = (todo["title"], todo["completed"], editing, edit_title)
+        if key == last_key:
+            yield last_tree
+            continue
+
+        class_name = _TODO_ITEM_CLASSES[(1 if todo["completed"] else 0) | (2 if editing else 0)]
 
-        yield h.li(className=" ".join(classes) if classes else None)[
+        last_key = key
+        last_tree = h.li(className=class_name)[
             h.div(className="view")[
                 h.input(
                     className="toggle",
@@ -76,7 +96,7 @@ def TodoItem(ctx, props):
                     onchange=toggle_todo
                 ),
                 h.label(ondblclick=start_editing)[todo["title"]],
-                h.button(className="destroy", onclick=delete_todo)
+                destroy_button
             ],
             h.input(
                 className="edit",
@@ -87,54 +107,47 @@ def TodoItem(ctx, props):
                 onblur=save_edit
             ) if editing else None
         ]
+        yield last_tree
 
 @component
 def TodoApp(ctx):
-    todos = []
+    # Todos keyed by id (dicts keep insertion order) for O(1) updates
+    todos = {}
     next_id = 1
     filter_type = "all"
 
-    @ctx.refresh
+    # Only called from handle_new_todo, whose refresh covers it
     def add_todo(title):
-        nonlocal todos, next_id
-        todos.append({
+        nonlocal next_id
+        todos[next_id] = {
             "id": next_id,
             "title": title,
             "completed": False
-        })
+        }
         next_id += 1
 
     @ctx.refresh
     def toggle_todo(todo_id):
-        nonlocal todos
-        for todo in todos:
-            if todo["id"] == todo_id:
-                todo["completed"] = not todo["completed"]
-                break
+        todo = todos[todo_id]
+        todo["completed"] = not todo["completed"]
 
     @ctx.refresh
     def edit_todo(todo_id, new_title):
-        nonlocal todos
-        for todo in todos:
-            if todo["id"] == todo_id:
-                todo["title"] = new_title
-                break
+        todos[todo_id]["title"] = new_title
 
     @ctx.refresh
     def delete_todo(todo_id):
-        nonlocal todos
-        todos = [t for t in todos if t["id"] != todo_id]
+        del todos[todo_id]
 
     @ctx.refresh
     def clear_completed(ev):
         nonlocal todos
-        todos = [t for t in todos if not t["completed"]]
+        todos = {todo_id: t for todo_id, t in todos.items() if not t["completed"]}
 
     @ctx.refresh
     def toggle_all(ev):
-        nonlocal todos
         all_completed = ev.target.checked
-        for todo in todos:
+        for todo in todos.values():
             todo["completed"] = all_completed
 
     def set_filter(new_filter):
@@ -152,37 +165,55 @@ def TodoApp(ctx):
                 add_todo(title)
                 ev.target.value = ""
 
+    # Static parts, built once
+    header = h.header(className="header")[
+        h.h1["todos"],
+        h.input(
+            className="new-todo",
+            placeholder="What needs to be done?",
+            onkeydown=handle_new_todo,
+            autofocus=True
+        )
+    ]
+    toggle_all_label = h.label(htmlfor="toggle-all")["Mark all as complete"]
+
+    # One handler per filter link, registered once rather than per render
+    show_all = set_filter("all")
+    show_active = set_filter("active")
+    show_completed = set_filter("completed")
+
     for _ in ctx:
+        # Split todos in a single pass - the filters and counts all come from it
+        active_todos = []
+        completed_todos = []
+        for todo in todos.values():
+            if todo["completed"]:
+                completed_todos.append(todo)
+            else:
+                active_todos.append(todo)
+
+        active_count = len(active_todos)
+        completed_count = len(completed_todos)
+
         # Filter todos based on current filter
         if filter_type == "active":
-            filtered_todos = [t for t in todos if not t["completed"]]
+            filtered_todos = active_todos
         elif filter_type == "completed":
-            filtered_todos = [t for t in todos if t["completed"]]
+            filtered_todos = completed_todos
         else:
-            filtered_todos = todos
-
-        active_count = len([t for t in todos if not t["completed"]])
-        completed_count = len([t for t in todos if t["completed"]])
+            filtered_todos = todos.values()
 
         yield h.section(className="todoapp")[
-            h.header(className="header")[
-                h.h1["todos"],
-                h.input(
-                    className="new-todo",
-                    placeholder="What needs to be done?",
-                    onkeydown=handle_new_todo,
-                    autofocus=True
-                )
-            ],
+            header,
             h.section(className="main", style={"display": "block" if todos else "none"})[
                 h.input(
                     id="toggle-all",
                     className="toggle-all",
                     type="checkbox",
-                    checked=len(todos) > 0 and all(t["completed"] for t in todos),
+                    checked=len(todos) > 0 and active_count == 0,
                     onchange=toggle_all
                 ),
-                h.label(htmlfor="toggle-all")["Mark all as complete"],
+                toggle_all_label,
                 h.ul(className="todo-list")[
                     [h(TodoItem,
                        todo=todo,
@@ -202,21 +233,21 @@ def TodoApp(ctx):
                     h.li[
                         h.a(
                             href="#/",
-                            onclick=set_filter("all"),
+                            onclick=show_all,
                             className="selected" if filter_type == "all" else None
                         )["All"]
                     ],
                     h.li[
                         h.a(
                             href="#/active",
-                            onclick=set_filter("active"),
+                            onclick=show_active,
                             className="selected" if filter_type == "active" else None
                         )["Active"]
                     ],
                     h.li[
                         h.a(
                             href="#/completed",
-                            onclick=set_filter("completed"),
+                            onclick=show_completed,
                             className="selected" if filter_type == "completed" else None
                         )["Completed"]
                     ]
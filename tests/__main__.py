@@ -3,94 +3,282 @@ import asyncio
 import sys
 import argparse
 import os
-import glob
+import functools
+import json
+import string
+import urllib.error
+import urllib.request
+from collections import deque
 
 from playwright.async_api import async_playwright
 
-async def run_test(test_file: str, runtime: str):
-    config = {
-        "experimental_create_proxy": "auto"
+# Console lines kept under --quiet, printed only when a page fails
+QUIET_CONSOLE_LINES = 20
+
+# Test pages are served at this address so their relative URLs resolve
+# against the dev server
+BASE_URL = "http://localhost:3333"
+TEST_PAGE_URL = f"{BASE_URL}/"
+
+# Files every test page loads into the interpreter's filesystem
+FILES = {
+    "https://raw.githubusercontent.com/ntoll/upytest/1.0.10/upytest.py": "upytest.py",
+    "./crank/__init__.py": "crank/__init__.py",
+    "./crank/dom.py": "crank/dom.py",
+    "./crank/html.py": "crank/html.py",
+    "./crank/typing_stub.py": "crank/typing_stub.py",
+    "./crank/async_.py": "crank/async_.py",
+}
+
+JS_MODULES = {
+    "main": {
+        "/node_modules/@b9g/crank/crank.js": "crank_core",
+        "/node_modules/@b9g/crank/dom.js": "crank_dom",
+        "/node_modules/@b9g/crank/async.js": "crank_async"
     }
-    if runtime == "micropython":
-        script_type = "mpy"
-    else:
-        script_type = "py"
+}
 
-    config["files"] = {
-        "https://raw.githubusercontent.com/ntoll/upytest/1.0.10/upytest.py": "upytest.py",
-        "./crank/__init__.py": "crank/__init__.py",
-        "./crank/dom.py": "crank/dom.py",
-        "./crank/html.py": "crank/html.py",
-        "./crank/typing_stub.py": "crank/typing_stub.py",
-        "./crank/async_.py": "crank/async_.py",
-        f"./tests/{test_file}": test_file
-    }
+# The shared part of every page's config, serialized once and left open at
+# the end of the files map so each page only encodes its own test files
+CONFIG_JSON_HEAD = json.dumps({
+    "experimental_create_proxy": "auto",
+    "js_modules": JS_MODULES,
+    "files": FILES,
+})[:-2]
 
-    config["js_modules"] = {
-        "main": {
-            "/node_modules/@b9g/crank/crank.js": "crank_core",
-            "/node_modules/@b9g/crank/dom.js": "crank_dom",
-            "/node_modules/@b9g/crank/async.js": "crank_async"
-        }
-    }
 
-    import json
-    config_html = f"<{script_type}-config>{json.dumps(config)}</{script_type}-config>"
+def config_json(test_files) -> str:
+    test_entries = json.dumps({f"./tests/{test_file}": test_file for test_file in test_files})
+    return f"{CONFIG_JSON_HEAD}, {test_entries[1:]}}}"
 
-    html = f"""<!DOCTYPE html><html>
-        <head>
-            <title>Single Test: {test_file}</title>
-            <link rel="stylesheet" href="/node_modules/@pyscript/core/dist/core.css">
-            <script type="module" src="/node_modules/@pyscript/core/dist/core.js"></script>
-        </head>
-        <body>
-            {config_html}
-            <{script_type}-script>
+# The same driver runs on both runtimes; $run_args is filled in per page
+TEST_SCRIPT = """
 import js
 import upytest
+from pyscript.ffi import to_js
 
 async def main():
-    result = await upytest.run("{test_file}")
+    result = await upytest.run($run_args)
 
     passes = len(result.get("passes", []))
     fails = len(result.get("fails", []))
     skipped = len(result.get("skipped", []))
 
-    js.window.TEST_RESULT = {{"passes": passes, "fails": fails, "skipped": skipped}}
+    await js.window.reportTestResult(to_js({"passes": passes, "fails": fails, "skipped": skipped}))
 
 await main()
-            </{script_type}-script>
-        </body>
-    </html>"""
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-
-        # Forward console messages and capture errors from the browser
-        script_error = None
+"""
 
-        def handle_error(err):
-            nonlocal script_error
-            script_error = str(err)
-            print(f"Script error: {err}")
 
-        page.on("console", lambda msg: print(msg.text))
-        page.on("pageerror", handle_error)
-
-        await page.goto("http://localhost:3333")
-        await page.set_content(html)
-
-        await page.wait_for_function("() => window.TEST_RESULT !== undefined", timeout=5000)
-        result = await page.evaluate("() => window.TEST_RESULT")
-
-        await browser.close()
+@functools.lru_cache(maxsize=None)
+def page_template(runtime: str) -> string.Template:
+    """The test page for a runtime, with $title, $config and $run_args to fill in"""
+    if runtime == "micropython":
+        script_type = "mpy"
+    else:
+        script_type = "py"
 
-        # If there was a script error, raise it
-        if script_error:
-            raise RuntimeError(f"PyScript execution failed: {script_error}")
+    return string.Template(f"""<!DOCTYPE html><html>
+        <head>
+            <title>Tests: $title</title>
+            <link rel="stylesheet" href="/node_modules/@pyscript/core/dist/core.css">
+            <script type="module" src="/node_modules/@pyscript/core/dist/core.js"></script>
+        </head>
+        <body>
+            <{script_type}-config>$config</{script_type}-config>
+            <{script_type}-script>{TEST_SCRIPT}</{script_type}-script>
+        </body>
+    </html>""")
+
+
+class TestPage:
+    """A pooled page; its listeners are registered once and feed whichever
+    run currently holds it"""
+
+    def __init__(self, page):
+        self.page = page
+        self.html = ""
+        self.result = None
+        self.crashed = False
+        self.on_console = self.on_error = lambda _: None
+
+    @classmethod
+    async def open(cls, context):
+        test_page = cls(await context.new_page())
+        page = test_page.page
+        page.on("console", lambda msg: test_page.on_console(msg.text))
+        page.on("pageerror", lambda err: test_page.on_error(err))
+        page.on("crash", lambda _: test_page.handle_crash())
+        return test_page
+
+    def report_result(self, result):
+        if self.result is not None and not self.result.done():
+            self.result.set_result(result)
+
+    def fail(self, message: str):
+        """End the current run now instead of waiting out its timeout"""
+        if self.result is not None and not self.result.done():
+            self.result.set_exception(RuntimeError(message))
+
+    def handle_crash(self):
+        self.crashed = True
+        self.fail("Page crashed")
+
+    async def serve(self, route):
+        await route.fulfill(body=self.html, content_type="text/html")
+
+
+class TestPagePool:
+    """Pooled test pages. The result binding and the page route are registered
+    once for the whole context and dispatched to the page involved"""
+
+    def __init__(self, context):
+        self.context = context
+        self.test_pages = {}
+        self.queue = asyncio.Queue()
+
+    @classmethod
+    async def open(cls, context, count: int):
+        pool = cls(context)
+        test_pages = pool.test_pages
+        await context.expose_binding(
+            "reportTestResult",
+            lambda source, result: test_pages[source["page"]].report_result(result),
+        )
+        # Answer the navigation with the generated page directly, rather than
+        # loading the server's index and then replacing it with set_content
+        await context.route(
+            TEST_PAGE_URL,
+            lambda route: test_pages[route.request.frame.page].serve(route),
+        )
+        context.on("close", pool.handle_close)
+
+        for test_page in await asyncio.gather(*(pool.open_page() for _ in range(count))):
+            pool.queue.put_nowait(test_page)
+        return pool
+
+    async def open_page(self):
+        test_page = await TestPage.open(self.context)
+        self.test_pages[test_page.page] = test_page
+        return test_page
+
+    def handle_close(self, _):
+        for test_page in self.test_pages.values():
+            test_page.fail("Browser closed")
+
+    def get(self):
+        return self.queue.get()
+
+    async def put(self, test_page):
+        """Return a page after a run, swapping in a new one if it can't be reused"""
+        if not test_page.crashed:
+            try:
+                # Unload the interpreter before the next run gets the page
+                await test_page.page.goto("about:blank")
+            except Exception:
+                pass
+            else:
+                self.queue.put_nowait(test_page)
+                return
+
+        # Crashed or broken - every later operation on it would throw, so
+        # one bad page mustn't fail every batch that draws it afterwards
+        del self.test_pages[test_page.page]
+        try:
+            await test_page.page.close()
+        except Exception:
+            pass
+        try:
+            test_page = await self.open_page()
+        except Exception:
+            # The browser is gone; hand the dead page back so waiting runs
+            # fail on their first navigation instead of waiting forever
+            pass
+        self.queue.put_nowait(test_page)
+
+
+async def run_test(pages, test_files, runtime: str, quiet: bool = False):
+    """Run the given test files on a pooled page, in a single upytest.run call"""
+    names = ", ".join(test_files)
+    html = page_template(runtime).substitute(
+        title=names,
+        config=config_json(test_files),
+        run_args=", ".join(repr(test_file) for test_file in test_files),
+    )
+
+    # Collect console messages and errors from the browser and print them
+    # in one block when the page is done, so concurrent runs don't interleave.
+    # Quiet runs only keep a bounded tail of the console for failures
+    output = [f"\nRunning {names} on {runtime}..."]
+    console = deque(maxlen=QUIET_CONSOLE_LINES) if quiet else output
+    script_error = None
+    result = None
+
+    def handle_error(err):
+        nonlocal script_error
+        script_error = str(err)
+        output.append(f"Script error: {err}")
+        # A script error fails the page anyway, and usually means no result
+        # is coming
+        test_page.fail(f"PyScript execution failed: {err}")
+
+    test_page = await pages.get()
+    test_page.html = html
+    test_page.on_console = console.append
+    test_page.on_error = handle_error
+    # The page calls back with its result, so there's nothing to poll for
+    test_page.result = asyncio.get_running_loop().create_future()
+
+    try:
+        await test_page.page.goto(TEST_PAGE_URL)
+        result = await asyncio.wait_for(test_page.result, timeout=5 * len(test_files))
+    finally:
+        await pages.put(test_page)
+        if quiet and (script_error or not result or result["fails"]):
+            output.append(f"Last {len(console)} console messages:")
+            output.extend(console)
+        print("\n".join(output))
+
+    # If there was a script error, raise it
+    if script_error:
+        raise RuntimeError(f"PyScript execution failed: {script_error}")
+
+    return result
+
+
+def server_running(url: str) -> bool:
+    """HEAD the dev server, so nothing but the status line is transferred"""
+    request = urllib.request.Request(url, method="HEAD")
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status < 500
+    except urllib.error.HTTPError as e:
+        return e.code < 500
+    except OSError:
+        return False
+
+
+async def run_runtime(pages, test_files, runtime: str, quiet: bool = False,
+                      single_page: bool = False):
+    print(f"\nRunning {len(test_files)} test files for {runtime}...")
+
+    # One page per test file isolates files from each other; a single page
+    # boots the interpreter once and lets upytest collect every file
+    batches = [test_files] if single_page else [[test_file] for test_file in test_files]
+
+    async def run_batch(batch):
+        # Pages mostly wait on interpreter startup, so several can load at
+        # once; a batch waits for a free page from the pool shared by all
+        # runtimes
+        try:
+            result = await run_test(pages, batch, runtime, quiet)
+            return result["fails"]
+        except Exception as e:
+            print(f"{', '.join(batch)}: Error running test - {e}")
+            return 1
 
-        return result
+    batch_fails = await asyncio.gather(*(run_batch(batch) for batch in batches))
+    return sum(batch_fails)
 
 
 async def main():
@@ -101,10 +289,21 @@ async def main():
                        help="Test files or patterns to run (e.g., test_basic.py, basic, async)")
     parser.add_argument("-k", "--keyword", dest="keyword",
                        help="Run tests matching given substring expression")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                       help="Only show browser console output for failing pages")
+    parser.add_argument("--single-page", action="store_true",
+                       help="Run all test files on one page per runtime instead of one page per file")
+    parser.add_argument("-j", "--jobs", type=int,
+                       default=int(os.environ.get("CRANK_TEST_CONCURRENCY", 4)),
+                       help="Maximum number of test pages open at once (default: 4)")
     args = parser.parse_args()
 
     # Find all test files in the tests directory
-    all_test_files = [os.path.basename(f) for f in glob.glob("tests/test_*.py")]
+    with os.scandir("tests") as entries:
+        all_test_files = [entry.name for entry in entries
+                          if entry.name.startswith("test_") and entry.name.endswith(".py")]
+    known_test_files = frozenset(all_test_files)
+    available = ', '.join([f.replace('test_', '').replace('.py', '') for f in all_test_files])
 
     # Determine which test files to run
     if args.tests:
@@ -116,13 +315,12 @@ async def main():
             else:
                 test_file = f"test_{test_pattern}.py"
 
-            if test_file in all_test_files:
+            if test_file in known_test_files:
                 test_files.append(test_file)
             else:
                 print(f"Warning: Unknown test '{test_pattern}'")
 
         if not test_files:
-            available = ', '.join([f.replace('test_', '').replace('.py', '') for f in all_test_files])
             print(f"No valid tests specified. Available: {available}")
             return 1
     elif args.keyword:
@@ -134,7 +332,6 @@ async def main():
                 test_files.append(test_file)
 
         if not test_files:
-            available = ', '.join([f.replace('test_', '').replace('.py', '') for f in all_test_files])
             print(f"No tests match keyword '{args.keyword}'. Available: {available}")
             return 1
     else:
@@ -148,23 +345,35 @@ async def main():
     else:
         runtimes = ["pyodide", "micropython"]
 
-    total_fails = 0
-
-    for runtime in runtimes:
-        print(f"\nRunning {len(test_files)} test files for {runtime}...")
-
-        runtime_fails = 0
-
-        for test_file in test_files:
-            print(f"\nRunning {test_file} on {runtime}...")
-            try:
-                result = await run_test(test_file, runtime)
-                runtime_fails += result["fails"]
-            except Exception as e:
-                print(f"{test_file}: Error running test - {e}")
-                runtime_fails += 1
+    # Launch Chromium once; tests share a pool of pages in one context (and
+    # its in-memory cache). The runtimes share nothing else, so run them side
+    # by side. Check the dev server while Playwright starts
+    server_ok, p = await asyncio.gather(
+        asyncio.get_running_loop().run_in_executor(None, server_running, BASE_URL),
+        async_playwright().start(),
+    )
+    try:
+        if not server_ok:
+            print(f"Server not running at {BASE_URL}. Run 'make serve' in another terminal.")
+            return 1
 
-        total_fails += runtime_fails
+        browser = await p.chromium.launch(headless=True)
+        try:
+            context = await browser.new_context()
+            # Open the pages once and reuse them, so each test skips page
+            # creation and listener setup
+            page_count = len(runtimes) * (1 if args.single_page else len(test_files))
+            pages = await TestPagePool.open(context, max(min(args.jobs, page_count), 1))
+
+            runtime_fails = await asyncio.gather(
+                *(run_runtime(pages, test_files, runtime, args.quiet, args.single_page)
+                  for runtime in runtimes)
+            )
+        finally:
+            await browser.close()
+    finally:
+        await p.stop()
+    total_fails = sum(runtime_fails)
 
     return 1 if total_fails > 0 else 0
 
@@ -223,4 +223,123 @@ def test_component_conditional_rendering():
     renderer.render(h(ConditionalComponent, show=False), document.body)
     hidden_div = document.querySelector("div")
     assert hidden_div is not None
-    assert hidden_div.textContent == "Hidden"
\ No newline at end of file
+    assert hidden_div.textContent == "Hidden"
+
+def test_component_called_once_per_render():
+    """Test component arity is resolved without probe calls"""
+    from crank import h, component
+    from crank.dom import renderer
+    from js import document
+
+    calls = []
+
+    @component
+    def CountingComponent(ctx, props):
+        calls.append(props.get("label", ""))
+        return h.div[f"Calls: {len(calls)}"]
+
+    document.body.innerHTML = ""
+    renderer.render(h(CountingComponent, label="once"), document.body)
+
+    # The component must not be invoked again while detecting its signature
+    assert calls == ["once"]
+    rendered_div = document.querySelector("div")
+    assert rendered_div is not None
+    assert rendered_div.textContent == "Calls: 1"
+
+def test_context_only_component_called_once_per_render():
+    """Test a (ctx) component isn't probed with extra arguments"""
+    from crank import h, component
+    from crank.dom import renderer
+    from js import document
+
+    calls = []
+
+    @component
+    def CountingContextComponent(ctx):
+        calls.append(ctx)
+        return h.div[f"Calls: {len(calls)}"]
+
+    document.body.innerHTML = ""
+    renderer.render(h(CountingContextComponent), document.body)
+
+    assert len(calls) == 1
+    rendered_div = document.querySelector("div")
+    assert rendered_div is not None
+    assert rendered_div.textContent == "Calls: 1"
+
+@skip("functools.wraps doesn't set __wrapped__ in MicroPython", skip_when=is_micropython)
+def test_wrapped_component_arity():
+    """Test functools.wraps components resolve to the wrapped function's arity"""
+    import functools
+    from crank import h, component
+    from crank.dom import renderer
+    from js import document
+
+    calls = []
+
+    def counted(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            calls.append(len(args))
+            return func(*args, **kwargs)
+        return wrapper
+
+    @component
+    @counted
+    def WrappedComponent(ctx):
+        return h.div["Wrapped"]
+
+    document.body.innerHTML = ""
+    renderer.render(h(WrappedComponent), document.body)
+
+    # Called once, with ctx only
+    assert calls == [1]
+    rendered_div = document.querySelector("div")
+    assert rendered_div is not None
+    assert rendered_div.textContent == "Wrapped"
+
+def test_component_props_mapping():
+    """Test component props behave like a dict"""
+    from crank import h, component
+    from crank.dom import renderer
+    from js import document
+
+    @component
+    def MappingComponent(ctx, props):
+        assert props["name"] == "Test"
+        assert "name" in props
+        assert "missing" not in props
+        assert props.get("missing", "default") == "default"
+        assert sorted(props.keys()) == ["count", "name"]
+        assert props.name == "Test"
+        assert props.to_dict() == {"name": "Test", "count": 3}
+        return h.div[f"{props['name']} {props['count']}"]
+
+    document.body.innerHTML = ""
+    renderer.render(h(MappingComponent, name="Test", count=3), document.body)
+
+    rendered_div = document.querySelector("div")
+    assert rendered_div is not None
+    assert rendered_div.textContent == "Test 3"
+
+def test_component_passes_props_through():
+    """Test h(Child, props) forwards a component's own props"""
+    from crank import h, component
+    from crank.dom import renderer
+    from js import document
+
+    @component
+    def Child(ctx, props):
+        return h.div[f"Child {props['name']}"]
+
+    @component
+    def Parent(ctx, props):
+        return h(Child, props)
+
+    document.body.innerHTML = ""
+    renderer.render(h(Parent, name="Test"), document.body)
+
+    rendered_div = document.querySelector("div")
+    assert rendered_div is not None
+    assert rendered_div.textContent == "Child Test"
@@ -147,4 +147,23 @@ def test_special_elements():
     assert portal is not None
     assert raw is not None
     assert text is not None
-    assert copy is not None
\ No newline at end of file
+    assert copy is not None
+
+def test_equal_props_keep_their_own_children():
+    """Test elements with identical props don't share children"""
+    from crank import h
+    from crank.dom import renderer
+    from js import document
+
+    document.body.innerHTML = ""
+    renderer.render(h.ul[
+        h.li(className="item")["a"],
+        h.li(className="item")["b"],
+        h.li(className="item"),
+    ], document.body)
+
+    items = document.querySelectorAll("li.item")
+    assert items.length == 3
+    assert items[0].textContent == "a"
+    assert items[1].textContent == "b"
+    assert items[2].textContent == ""